@@ -18,7 +18,8 @@ Automatically configures `mkdocs-exclude` by:
 
 - Adding or modifying the `exclude` plugin configuration in the generated
     `mkdocs.subset.yml`
-- Using regex patterns to exclude entire directory trees (e.g., `^langchain/.*`)
+- Using a single regex pattern to exclude entire directory trees (e.g.,
+    `^(?:langchain|langsmith)/`)
 - Disabling cross-references
 - Preserving existing exclude configurations from the original mkdocs.yml (if any)
 
@@ -30,18 +31,20 @@ When serving only the "LangGraph" section:
 Available directories: ['langchain', 'langgraph', 'langsmith', 'integrations']
 Kept directories:      ['langgraph']  # From nav analysis
 Always keep:           ['_snippets', 'javascripts', 'static', 'stylesheets']
-Excluded patterns:     ['^langchain/.*', '^langsmith/.*', '^integrations/.*']
+Excluded pattern:      '^(?:integrations|langchain|langsmith)/'
 ```
 
-The generated mkdocs.subset.yml will include:
+The generated mkdocs.subset.yml inherits the original config and overrides only the
+nav and plugins:
 
 ```yaml
+INHERIT: /path/to/mkdocs.yml
+nav:
+  # ... the requested section (plus "Get started")
 plugins:
   - exclude:
       regex:
-        - ^langchain/.*
-        - ^langsmith/.*
-        - ^integrations/.*
+        - ^(?:integrations|langchain|langsmith)/
   # ... other plugins
 ```
 
@@ -49,14 +52,62 @@ Usage:
     python serve_subset.py langgraph  # Serve only the LangGraph section
 """  # noqa: INP001
 
+from __future__ import annotations
+
 import argparse
+import contextlib
+import json
+import os
+import re
 import socket
 import subprocess
 import sys
 from collections import deque
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    import yaml
+
+SERVE_WRAPPER = """\
+python=$1
+shift
+trap 'echo; echo "Stopping server..."' INT
+trap 'echo; echo "Stopping server..."; kill -INT "$pid" 2>/dev/null' TERM
+trap 'rm -f "$0"; echo "Removed $0"' EXIT
+"$python" -c 'import os, signal, sys
+signal.signal(signal.SIGINT, signal.SIG_DFL)
+os.execvp(sys.argv[1], sys.argv[1:])' "$@" <&0 &
+pid=$!
+wait "$pid"
+status=$?
+while kill -0 "$pid" 2>/dev/null; do
+    wait "$pid"
+    status=$?
+done
+exit "$status"
+"""
+"""POSIX shell script exec'd in place of this process to run the server.
+
+Called as `sh -c SERVE_WRAPPER <config> <python> <cmd>...`. Removes the temporary
+config file once the server exits.
+
+The server runs in the background so that `wait` can be interrupted to pass a `SIGTERM`
+on as `SIGINT`, letting mkdocs shut down cleanly just as on Ctrl-C. `sh` starts
+background commands with `SIGINT` ignored, so `<python>` is used to restore its
+default handling before exec'ing the server command.
+"""
+
+OUTPUT_BUFFER_SIZE = 1 << 16
+"""Write buffer size in bytes for the generated config file."""
 
-import yaml
+CONFIG_CACHE_SUFFIX = ".cache.json"
+"""Suffix appended to the config file name for the cached parsed config."""
+
+PORT_PROBE_TIMEOUT = 0.05
+"""Timeout in seconds when probing whether a local port is in use."""
 
 ALIAS_MAP = {
     "deepagents": "Deep Agents",
@@ -70,6 +121,21 @@ Canonical section names are the keys defined in the `mkdocs.yml` `nav`.
 Allows specifying shorter names when running the script.
 """
 
+_ALIAS_MAP_CI = {alias.casefold(): section for alias, section in ALIAS_MAP.items()}
+"""Case-folded `ALIAS_MAP` for case-insensitive alias lookup."""
+
+ALWAYS_KEEP = frozenset(
+    {
+        "_snippets",
+        "javascripts",
+        "static",
+        "stylesheets",
+        "overrides",
+        "templates",
+    }
+)
+"""Top-level docs directories (assets, snippets, etc.) that are never excluded."""
+
 # --- Custom YAML handling to preserve tags ---
 
 
@@ -94,6 +160,14 @@ class EnvTag:
         """Return string representation of `EnvTag`."""
         return f"EnvTag({self.value})"
 
+    def __eq__(self, other: object) -> bool:
+        """Compare `EnvTag` objects by value."""
+        if not isinstance(other, EnvTag):
+            return NotImplemented
+        return self.value == other.value
+
+    __hash__ = None  # type: ignore[assignment]
+
 
 class PythonNameTag:
     """Custom YAML tag for Python name references.
@@ -116,8 +190,18 @@ class PythonNameTag:
         """Return string representation of `PythonNameTag`."""
         return f"PythonNameTag({self.suffix})"
 
+    def __eq__(self, other: object) -> bool:
+        """Compare `PythonNameTag` objects by suffix."""
+        if not isinstance(other, PythonNameTag):
+            return NotImplemented
+        return self.suffix == other.suffix
+
+    __hash__ = None  # type: ignore[assignment]
 
-def env_constructor(loader: yaml.SafeLoader, node: yaml.Node) -> EnvTag:
+
+def env_constructor(
+    loader: yaml.SafeLoader | yaml.CSafeLoader, node: yaml.Node
+) -> EnvTag:
     """YAML constructor for `!ENV` tags.
 
     Args:
@@ -127,6 +211,8 @@ def env_constructor(loader: yaml.SafeLoader, node: yaml.Node) -> EnvTag:
     Returns:
         EnvTag: Wrapped environment tag value.
     """
+    import yaml  # noqa: PLC0415
+
     if isinstance(node, yaml.SequenceNode):
         value: str | list = loader.construct_sequence(node)
     elif isinstance(node, (yaml.ScalarNode, yaml.MappingNode)):
@@ -137,7 +223,9 @@ def env_constructor(loader: yaml.SafeLoader, node: yaml.Node) -> EnvTag:
     return EnvTag(value)
 
 
-def env_representer(dumper: yaml.SafeDumper, data: EnvTag) -> yaml.Node:
+def env_representer(
+    dumper: yaml.SafeDumper | yaml.CSafeDumper, data: EnvTag
+) -> yaml.Node:
     """YAML representer for `EnvTag` objects.
 
     Args:
@@ -153,7 +241,7 @@ def env_representer(dumper: yaml.SafeDumper, data: EnvTag) -> yaml.Node:
 
 
 def python_name_multi_constructor(
-    _loader: yaml.SafeLoader, tag_suffix: str, _node: yaml.Node
+    _loader: yaml.SafeLoader | yaml.CSafeLoader, tag_suffix: str, _node: yaml.Node
 ) -> PythonNameTag:
     """YAML multi-constructor for Python name tags.
 
@@ -168,7 +256,9 @@ def python_name_multi_constructor(
     return PythonNameTag(tag_suffix)
 
 
-def python_name_representer(dumper: yaml.SafeDumper, data: PythonNameTag) -> yaml.Node:
+def python_name_representer(
+    dumper: yaml.SafeDumper | yaml.CSafeDumper, data: PythonNameTag
+) -> yaml.Node:
     """YAML representer for `PythonNameTag` objects.
 
     Args:
@@ -181,104 +271,162 @@ def python_name_representer(dumper: yaml.SafeDumper, data: PythonNameTag) -> yam
     return dumper.represent_scalar(f"tag:yaml.org,2002:python/name:{data.suffix}", "")
 
 
-# Register with SafeLoader
-yaml.SafeLoader.add_constructor("!ENV", env_constructor)
-yaml.SafeLoader.add_multi_constructor(
-    "tag:yaml.org,2002:python/name:", python_name_multi_constructor
-)
+def _setup_yaml() -> tuple[
+    ModuleType,
+    type[yaml.SafeLoader | yaml.CSafeLoader],
+    type[yaml.SafeDumper | yaml.CSafeDumper],
+]:
+    """Import PyYAML and register the custom tag handling.
 
+    Deferred until the command-line arguments have been validated so that `--help` and
+    argument errors don't pay for importing `yaml`. Prefers the libyaml C bindings when
+    available, falling back to the pure-Python classes.
 
-class CustomDumper(yaml.SafeDumper):
-    """Custom YAML dumper that preserves special YAML tags from `mkdocs.yml`.
+    Returns:
+        The `yaml` module, the loader for reading `mkdocs.yml`, and the `CustomDumper`
+        for writing the subset.
+    """
+    import yaml  # noqa: PLC0415
 
-    When this script reads the original `mkdocs.yml` file and modifies it (e.g.,
-    creating a subset navigation), it needs to write the modified configuration back to
-    a new YAML file while preserving the original custom tags.
+    try:
+        from yaml import CSafeDumper as Dumper  # noqa: PLC0415
+        from yaml import CSafeLoader as Loader  # noqa: PLC0415
+    except ImportError:
+        from yaml import (  # type: ignore[assignment]  # noqa: PLC0415
+            SafeDumper as Dumper,
+        )
+        from yaml import (  # type: ignore[assignment]  # noqa: PLC0415
+            SafeLoader as Loader,
+        )
 
-    Without this, tags like `!ENV [VAR_NAME, default]` or
-    `!!python/name:material.extensions.emoji.to_svg` would be lost during the YAML
-    serialization process.
+    # Register with the selected loader
+    Loader.add_constructor("!ENV", env_constructor)
+    Loader.add_multi_constructor(
+        "tag:yaml.org,2002:python/name:", python_name_multi_constructor
+    )
 
-    This dumper ensures special YAML tags are preserved in the output `mkdocs.subset.yml`
-    file so MkDocs can still process them correctly.
-    """
+    class CustomDumper(Dumper):
+        """Custom YAML dumper that preserves special YAML tags from `mkdocs.yml`.
 
+        When this script reads the original `mkdocs.yml` file and modifies it (e.g.,
+        creating a subset navigation), it needs to write the modified configuration
+        back to a new YAML file while preserving the original custom tags.
 
-CustomDumper.add_representer(EnvTag, env_representer)
-CustomDumper.add_representer(PythonNameTag, python_name_representer)
+        Without this, tags like `!ENV [VAR_NAME, default]` or
+        `!!python/name:material.extensions.emoji.to_svg` would be lost during the YAML
+        serialization process.
 
-# --- End Custom YAML handling ---
+        This dumper ensures special YAML tags are preserved in the output
+        `mkdocs.subset.yml` file so MkDocs can still process them correctly.
+        """
 
+    CustomDumper.add_representer(EnvTag, env_representer)
+    CustomDumper.add_representer(PythonNameTag, python_name_representer)
 
-def find_section(nav: list, target: str) -> dict | None:
-    """Search for a section in the nav using BFS.
+    return yaml, Loader, CustomDumper
 
-    Use BFS since we're typically not building a deep subset. Resolves issues where some
-    subsections share names with higher-level sections (e.g. `langsmith` under
-    langchain-classic).
+
+# --- End Custom YAML handling ---
+
+
+def _encode_tag(obj: object) -> dict:
+    """JSON `default` hook that encodes custom YAML tags as tagged dicts.
 
     Args:
-        nav: The nav from mkdocs.yml
-        target: The section name to search for (case-insensitive)
+        obj: Object the JSON encoder can't serialize natively.
 
     Returns:
-        The matching navigation section as a `dict`, or `None` if not found
+        Tagged dict representation of the custom tag.
 
-    Example:
-        ```python
-        nav = [
-            {'Home': 'index.md'},
-            {'LangGraph':
-                [
-                    {'Introduction': 'langgraph/index.md'}
-                ]
-            }
-        ]
+    Raises:
+        TypeError: If `obj` is not a custom tag.
+    """
+    if isinstance(obj, EnvTag):
+        return {"__env__": obj.value}
+    if isinstance(obj, PythonNameTag):
+        return {"__python_name__": obj.suffix}
+    msg = f"Object of type {type(obj).__name__} is not JSON serializable"
+    raise TypeError(msg)
 
-        find_section(nav, 'langgraph')
-        # {'LangGraph':
-        #   [
-        #       {'Introduction': 'langgraph/index.md'}
-        #   ]
-        # }
-        ```
+
+def _decode_tag(obj: dict) -> object:
+    """JSON `object_hook` that restores custom YAML tags from tagged dicts.
+
+    Args:
+        obj: Decoded JSON object.
+
+    Returns:
+        The restored custom tag, or `obj` unchanged if it is not a tagged dict.
     """
-    target = target.lower()
+    if len(obj) == 1:
+        if "__env__" in obj:
+            return EnvTag(obj["__env__"])
+        if "__python_name__" in obj:
+            return PythonNameTag(obj["__python_name__"])
+    return obj
 
-    # BFS queue: (nav_item, path_for_debugging)
-    queue: deque[tuple[dict | list | str, list[str]]] = deque()
 
-    # Initialize queue with top-level items
-    if isinstance(nav, list):
-        for item in nav:
-            queue.append((item, []))
-    else:
-        queue.append((nav, []))
+def _config_cache_key(stat: os.stat_result) -> list[int]:
+    """Build the cache key identifying a version of the config file.
 
-    while queue:
-        current_nav, path = queue.popleft()
+    Args:
+        stat: Result of `stat()` on the config file.
+
+    Returns:
+        The file's modification time (in nanoseconds) and size.
+    """
+    return [stat.st_mtime_ns, stat.st_size]
 
-        if isinstance(current_nav, dict):
-            key = next(iter(current_nav.keys()))
-            current_path = [*path, key]
 
-            # Check if this key matches our target
-            if target == key.lower():
-                return current_nav
+def read_config_cache(config_path: Path, cache_path: Path) -> dict | None:
+    """Read the parsed config cached by a previous run.
 
-            # Add children to queue for next level
-            child = current_nav[key]
-            if isinstance(child, list):
-                for child_item in child:
-                    queue.append((child_item, current_path))
-            elif isinstance(child, dict):
-                queue.append((child, current_path))
+    `mkdocs.yml` rarely changes between runs, and parsing the cached JSON is much
+    faster than parsing the YAML again.
+
+    Args:
+        config_path: Path to the original mkdocs.yml file.
+        cache_path: Path to the cached parsed config.
 
+    Returns:
+        The cached config, or `None` if there is no cache or it is stale.
+    """
+    try:
+        with cache_path.open() as f:
+            cache = json.load(f, object_hook=_decode_tag)
+        if cache["key"] == _config_cache_key(config_path.stat()):
+            return cache["config"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
     return None
 
 
+def write_config_cache(cache_path: Path, cache_key: list[int], config: dict) -> None:
+    """Cache the parsed config for subsequent runs.
+
+    Caching is best-effort: if the config can't be represented as JSON exactly (e.g. it
+    has non-string mapping keys, which JSON would turn into strings) or the cache can't
+    be written, the YAML is simply parsed again next time.
+
+    Args:
+        cache_path: Path to write the cached parsed config to.
+        cache_key: Key identifying the version of the config file that was parsed.
+        config: The parsed config.
+    """
+    with contextlib.suppress(OSError, TypeError, ValueError):
+        payload = json.dumps({"key": cache_key, "config": config}, default=_encode_tag)
+        # Only cache configs that come back unchanged, so a cache hit always matches a
+        # fresh parse of the YAML
+        if json.loads(payload, object_hook=_decode_tag)["config"] != config:
+            return
+        cache_path.write_text(payload)
+
+
 def is_port_available(port: int) -> bool:
-    """Check if a port is available for binding.
+    """Check if a port is available by probing for a server listening on it.
+
+    Connecting is a single syscall per probe and, unlike binding, isn't affected by
+    ports left in TIME_WAIT by a previous server.
 
     Args:
         port: Port number to check
@@ -286,12 +434,10 @@ def is_port_available(port: int) -> bool:
     Returns:
         True if port is available, False if in use
     """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.bind(("localhost", port))
-            return True
-    except OSError:
-        return False
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(PORT_PROBE_TIMEOUT)
+        # Use the loopback address directly to skip resolving `localhost`
+        return sock.connect_ex(("127.0.0.1", port)) != 0
 
 
 def find_available_port(start_port: int = 8000, max_attempts: int = 10) -> int:
@@ -318,18 +464,20 @@ def find_available_port(start_port: int = 8000, max_attempts: int = 10) -> int:
     raise RuntimeError(msg)
 
 
-def get_all_paths(nav_item: list | dict | str) -> list[str]:
-    """Recursively extract all file paths from a nav item.
+def get_root_dirs(nav_item: list | dict | str) -> set[str]:
+    """Extract the top-level directories of all file paths in a nav item.
 
-    Traverses through the given nav item and collects all file paths (as string values)
-    from nested lists and dictionaries. Used to determine which files are included in a
-    documentation subset.
+    Traverses through the given nav item and collects the first path segment of all
+    file paths (as string values) from nested lists and dictionaries. Used to determine
+    which docs directories are included in a documentation subset.
+
+    Uses an explicit stack rather than recursion to avoid per-node call overhead.
 
     Args:
         nav_item: A navigation item which can be a list, dict, or string
 
     Returns:
-        List of file paths found in the navigation structure
+        Set of top-level directories (or root-level files) referenced in the nav item
 
     Example:
         ```python
@@ -340,20 +488,110 @@ def get_all_paths(nav_item: list | dict | str) -> list[str]:
             ]
         }
 
-        get_all_paths(nav)
-        # ['langgraph/index.md', 'langgraph/tutorial.md']
+        get_root_dirs(nav)
+        # {'langgraph'}
+        ```
+    """
+    roots: set[str] = set()
+    stack: list[list | dict | str] = [nav_item]
+    roots_add = roots.add
+    stack_pop = stack.pop
+    stack_extend = stack.extend
+    while stack:
+        item = stack_pop()
+        # Strings are the leaves and the most common node type
+        if isinstance(item, str):
+            # Handle paths like 'langchain/index.md' -> 'langchain'
+            roots_add(item.partition("/")[0])
+        elif isinstance(item, list):
+            stack_extend(item)
+        elif isinstance(item, dict):
+            stack_extend(item.values())
+    return roots
+
+
+def walk_nav(nav: list, target: str) -> tuple[list[dict], dict | None, set[str]]:
+    """Select the nav subset and collect the docs directories it references.
+
+    Top-level items are checked for the "Get started" / root index entries that are
+    always kept while the nav is searched for the target section.
+
+    Use BFS since we're typically not building a deep subset. Resolves issues where some
+    subsections share names with higher-level sections (e.g. `langsmith` under
+    langchain-classic). Once the target is found, only the kept items are descended into
+    to collect the top-level directories used to determine which files are included in
+    the subset.
+
+    Args:
+        nav: The nav from mkdocs.yml
+        target: The section name to search for (case-insensitive)
+
+    Returns:
+        A tuple of the always-kept top-level items, the matching navigation section as a
+            `dict` (or `None` if not found), and the top-level directories referenced
+            by the kept items
+
+    Example:
+        ```python
+        nav = [
+            {'Get started': 'index.md'},
+            {'LangGraph':
+                [
+                    {'Introduction': 'langgraph/index.md'}
+                ]
+            }
+        ]
+
+        walk_nav(nav, 'langgraph')
+        # (
+        #     [{'Get started': 'index.md'}],
+        #     {'LangGraph': [{'Introduction': 'langgraph/index.md'}]},
+        #     {'index.md', 'langgraph'},
+        # )
         ```
     """
-    paths = []
-    if isinstance(nav_item, list):
-        for item in nav_item:
-            paths.extend(get_all_paths(item))
-    elif isinstance(nav_item, dict):
-        for value in nav_item.values():
-            paths.extend(get_all_paths(value))
-    elif isinstance(nav_item, str):
-        paths.append(nav_item)
-    return paths
+    target = target.lower()
+    prelude_items: list[dict] = []
+    found_section: dict | None = None
+
+    # BFS queue of visited items whose children still need to be checked
+    queue: deque[dict] = deque()
+    queue_append = queue.append
+    queue_popleft = queue.popleft
+
+    for item in nav:
+        if not isinstance(item, dict):
+            continue
+        key = next(iter(item))
+        key_lower = key.lower()
+
+        # Always keep "Get started" / root index
+        if "get started" in key_lower or item[key] == "index.md":
+            prelude_items.append(item)
+
+        if found_section is None:
+            if target == key_lower:
+                found_section = item
+            else:
+                queue_append(item)
+
+    # Check children as they are enqueued so the search stops at the first match
+    while found_section is None and queue:
+        current_nav = queue_popleft()
+        child = current_nav[next(iter(current_nav))]
+        for item in child if isinstance(child, list) else (child,):
+            if isinstance(item, dict):
+                if target == next(iter(item)).lower():
+                    found_section = item
+                    break
+                queue_append(item)
+
+    if found_section is None:
+        return prelude_items, None, set()
+
+    # Collect the directories referenced by the kept items only
+    kept_roots = get_root_dirs([*prelude_items, found_section])
+    return prelude_items, found_section, kept_roots
 
 
 def main() -> None:
@@ -413,20 +651,30 @@ def main() -> None:
 
     # Resolve alias
     target_section: str = args.section
-    if target_section.lower() in ALIAS_MAP:
-        target_section = ALIAS_MAP[target_section.lower()]
+    resolved = _ALIAS_MAP_CI.get(target_section.casefold())
+    if resolved is not None:
+        target_section = resolved
         print(f"Resolved alias '{args.section}' to '{target_section}'")
 
-    # Load the original mkdocs.yml
-    try:
-        with Path(args.config).open() as f:
-            config = yaml.load(f, Loader=yaml.SafeLoader)
-    except FileNotFoundError:
-        print(f"Error: Could not find {args.config}")
-        sys.exit(1)
-    except yaml.YAMLError as e:
-        print(f"Error parsing YAML: {e}")
-        sys.exit(1)
+    yaml, loader, custom_dumper = _setup_yaml()
+
+    # Load the original mkdocs.yml, reusing the parsed config from a previous run if the
+    # file hasn't changed since
+    config_path = Path(args.config)
+    cache_path = config_path.with_name(config_path.name + CONFIG_CACHE_SUFFIX)
+    config = read_config_cache(config_path, cache_path)
+    if config is None:
+        try:
+            with config_path.open() as f:
+                cache_key = _config_cache_key(os.fstat(f.fileno()))
+                config = yaml.load(f, Loader=loader)
+        except FileNotFoundError:
+            print(f"Error: Could not find {args.config}")
+            sys.exit(1)
+        except yaml.YAMLError as e:
+            print(f"Error parsing YAML: {e}")
+            sys.exit(1)
+        write_config_cache(cache_path, cache_key, config)
 
     # Validate nav presence
     if "nav" not in config:
@@ -434,82 +682,56 @@ def main() -> None:
         sys.exit(1)
 
     original_nav: list = config["nav"]
-    new_nav = []
-
-    # Always keep "Get started" / root index
-    for item in original_nav:
-        if isinstance(item, dict):
-            key = next(iter(item.keys()))
-            value = item[key]
-            if "get started" in key.lower() or (
-                isinstance(value, str) and value == "index.md"
-            ):
-                new_nav.append(item)
 
-    # Find the requested section
-    found_section = find_section(original_nav, target_section)
+    # Find the requested section along with the always-kept items and their directories
+    prelude_items, found_section, kept_roots = walk_nav(original_nav, target_section)
 
     if not found_section:
         print(f"Error: No section matching '{target_section}' found in nav.")
         sys.exit(1)
 
-    new_nav.append(found_section)
-    config["nav"] = new_nav  # Replace nav with new subset
+    new_nav = [*prelude_items, found_section]
+
+    # Locate the plugins to modify in a single pass over the plugin list
+    exclude_plugin = None
+    mkdocstrings_plugin = None
+    for plugin in config.get("plugins", ()):
+        if isinstance(plugin, dict):
+            if exclude_plugin is None and "exclude" in plugin:
+                exclude_plugin = plugin
+            if mkdocstrings_plugin is None and "mkdocstrings" in plugin:
+                mkdocstrings_plugin = plugin
+            if exclude_plugin is not None and mkdocstrings_plugin is not None:
+                break
 
     # --- Exclusion Logic ---
 
-    # 1. Identify kept paths
-    kept_paths = get_all_paths(new_nav)
-    kept_roots = set()
-    for p in kept_paths:
-        # Handle paths like 'langchain/index.md' -> 'langchain'
-        parts = p.split("/")
-        if len(parts) > 0:
-            kept_roots.add(parts[0])
+    # 1. Identify kept roots
     print(f"Kept top-level directories: {kept_roots}")
 
     # 2. Identify all top-level docs directories
-    docs_dir = Path("docs")
-    if not docs_dir.exists():
+    docs_dir = "docs"
+    try:
+        # Directory entry types come from readdir(), avoiding a stat() per entry
+        with os.scandir(docs_dir) as entries:
+            all_roots = {entry.name for entry in entries if entry.is_dir()}
+    except FileNotFoundError:
         print(f"Warning: {docs_dir} directory not found. Skipping exclusion logic.")
     else:
-        all_roots = [d.name for d in docs_dir.iterdir() if d.is_dir()]
-
-        # 3. Directories to keep always (assets, snippets, etc.)
-        always_keep = {
-            "_snippets",
-            "javascripts",
-            "static",
-            "stylesheets",
-            "overrides",
-            "templates",
-        }
+        # 3. Calculate excludes, always keeping asset directories
+        excluded_roots = sorted(all_roots - kept_roots - ALWAYS_KEEP)
 
-        # 4. Calculate excludes
-        to_exclude = [
-            f"{root}/**/*"
-            for root in all_roots
-            if root not in kept_roots and root not in always_keep
-        ]
-
-        if to_exclude:
-            print(f"Excluding patterns: {to_exclude}")
-            # Try using explicit regex patterns instead of glob patterns
-            regex_patterns = []
-            for pattern in to_exclude:
-                # Convert glob patterns to regex
-                # langchain/**/* -> ^langchain/.*
-                root = pattern.split("/")[0]
-                regex_patterns.append(f"^{root}/.*")
+        if excluded_roots:
+            print(f"Excluding directories: {excluded_roots}")
+            # Use a single anchored alternation instead of a pattern per directory so
+            # mkdocs-exclude runs one regex match per file
+            # [langchain, langsmith] -> ^(?:langchain|langsmith)/
+            roots_pattern = "|".join(re.escape(root) for root in excluded_roots)
+            regex_patterns = [f"^(?:{roots_pattern})/"]
 
             # Configure mkdocs-exclude plugin to exclude paths
             if "plugins" not in config:
                 config["plugins"] = []
-            exclude_plugin = None
-            for p in config["plugins"]:
-                if isinstance(p, dict) and "exclude" in p:
-                    exclude_plugin = p
-                    break
             if exclude_plugin:
                 if "regex" not in exclude_plugin["exclude"]:
                     exclude_plugin["exclude"]["regex"] = []
@@ -521,40 +743,44 @@ def main() -> None:
 
     # --- Remove modules from preload_modules in original mkdocs.yml ---
 
-    # Find and update mkdocstrings plugin configuration
-    for plugin in config.get("plugins", []):
-        if isinstance(plugin, dict) and "mkdocstrings" in plugin:
-            mkdocstrings_config = plugin["mkdocstrings"]
-            handlers = mkdocstrings_config.get("handlers", {})
-            python_handler = handlers.get("python", {})
-            options = python_handler.get("options", {})
-
-            if "preload_modules" in options:
-                # Disable preloading modules
-                original_preload = options["preload_modules"]
-                options["preload_modules"] = []
-                print(f"Filtered preload_modules: {original_preload} → []")
-
-            # Disable signature cross-references
-            options["signature_crossrefs"] = False
-
-            # Disable auto-discovery of packages to prevent cross-references
-            options["show_inheritance_diagram"] = False
-            options["allow_inspection"] = False
-
-            # Disable imports and inventory that might cause cross-package resolution
-            # issues when serving subsets
-            options["enable_inventory"] = False
-            handlers["python"]["import"] = []
-
-            break
-
-    # Write the new mkdocs.yml using the output name
-    with Path(args.out).open("w") as f:
+    # Update mkdocstrings plugin configuration
+    if mkdocstrings_plugin is not None:
+        mkdocstrings_config = mkdocstrings_plugin["mkdocstrings"]
+        handlers = mkdocstrings_config.get("handlers", {})
+        python_handler = handlers.get("python", {})
+        options = python_handler.get("options", {})
+
+        if "preload_modules" in options:
+            # Disable preloading modules
+            original_preload = options["preload_modules"]
+            options["preload_modules"] = []
+            print(f"Filtered preload_modules: {original_preload} → []")
+
+        # Disable signature cross-references
+        options["signature_crossrefs"] = False
+
+        # Disable auto-discovery of packages to prevent cross-references
+        options["show_inheritance_diagram"] = False
+        options["allow_inspection"] = False
+
+        # Disable imports and inventory that might cause cross-package resolution
+        # issues when serving subsets
+        options["enable_inventory"] = False
+        handlers["python"]["import"] = []
+
+    # Only the nav and plugins differ from the original mkdocs.yml, so inherit the rest
+    # from it instead of writing the whole config back out
+    subset_config = {"INHERIT": str(config_path.resolve()), "nav": new_nav}
+    if "plugins" in config:
+        subset_config["plugins"] = config["plugins"]
+
+    # Write the new mkdocs.yml using the output name. A larger write buffer coalesces
+    # the emitter's many small writes into fewer syscalls.
+    with Path(args.out).open("w", buffering=OUTPUT_BUFFER_SIZE) as f:
         yaml.dump(
-            config,
+            subset_config,
             f,
-            Dumper=CustomDumper,  # Use custom dumper to preserve tags
+            Dumper=custom_dumper,  # Use custom dumper to preserve tags
             sort_keys=False,  # Preserve key order
         )
     print(f"Generated {args.out}")
@@ -577,16 +803,25 @@ def main() -> None:
         cmd.append("--dirty")
 
     print(f"Running: {' '.join(cmd)}")
-    try:
-        subprocess.run(cmd, check=True)  # noqa: S603
-    except KeyboardInterrupt:
-        print("\nStopping server...")
-    finally:
-        output_path = Path(args.out)
-        if output_path.exists():
-            # Cleanup temporary config file
-            output_path.unlink()
-            print(f"Removed {args.out}")
+    if os.name != "posix":
+        # No exec/sh available, so wait on the server and clean up afterwards
+        try:
+            subprocess.run(cmd, check=True)  # noqa: S603
+        except KeyboardInterrupt:
+            print("\nStopping server...")
+        finally:
+            output_path = Path(args.out)
+            if output_path.exists():
+                # Cleanup temporary config file
+                output_path.unlink()
+                print(f"Removed {args.out}")
+        return
+
+    # Replace this process with the server rather than waiting on it. Only a minimal
+    # shell stays behind, to remove the temporary config file once the server stops.
+    sys.stdout.flush()
+    wrapper_cmd = ["sh", "-c", SERVE_WRAPPER, args.out, sys.executable, *cmd]
+    os.execvp("sh", wrapper_cmd)  # noqa: S606, S607
 
 
 if __name__ == "__main__":